@@ -3,15 +3,35 @@ from agno.models.deepseek import DeepSeek
 from agno.tools.yfinance import YFinanceTools
 from dotenv import load_dotenv
 from datetime import datetime
+import asyncio
+import httpx
 import os
+import sys
+import time
+
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+except ImportError:
+    PromptSession = None
 
 load_dotenv()
 
-agent = Agent(  
+# One pooled client for the whole REPL session - sequential model calls
+# reuse the TCP/TLS connection instead of re-handshaking every turn.
+# Async because the REPL streams through agent.arun (AsyncOpenAI rejects
+# a sync client).
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=8, max_connections=32),
+    timeout=httpx.Timeout(60.0, connect=10.0),
+)
+
+agent = Agent(
     name="Finance Analyst",
     model=DeepSeek(
         id="deepseek-chat",
-        api_key=os.getenv("DEEPSEEK_API_KEY")),
+        api_key=os.getenv("DEEPSEEK_API_KEY"),
+        http_client=http_client),
     tools=[YFinanceTools(stock_price=True)],
     instructions="Use tables to display data. Don't include any other text.",
     markdown=True
@@ -20,15 +40,54 @@ agent = Agent(
 #agent.print_response("What is the stock price of Apple?", stream=True)
 
 
-while True:
-        user_input = input("\nYou: ").strip()
+async def stream_response(agent, message, min_chars=32, flush_interval=0.025):
+    """Stream a response, coalescing chunks before writing to stdout
+
+    Per-token terminal writes dominate CPU at high tokens/s; buffering to
+    >=min_chars or flush_interval seconds keeps output smooth while cutting
+    the number of stdout flushes by an order of magnitude.
+    """
+    buf = []
+    buf_len = 0
+    last_flush = time.monotonic()
+    async for chunk in await agent.arun(message, stream=True):
+        content = chunk.content
+        if not content:
+            continue
+        buf.append(content)
+        buf_len += len(content)
+        now = time.monotonic()
+        if buf_len >= min_chars or now - last_flush >= flush_interval:
+            sys.stdout.write("".join(buf))
+            sys.stdout.flush()
+            buf, buf_len, last_flush = [], 0, now
+    if buf:
+        sys.stdout.write("".join(buf))
+        sys.stdout.flush()
+    print()
+
+
+async def read_input(session):
+    if session is not None:
+        # Non-blocking prompt with persistent readline-style history
+        return (await session.prompt_async("\nYou: ")).strip()
+    return input("\nYou: ").strip()
+
+
+async def main():
+    session = None
+    if PromptSession is not None:
+        session = PromptSession(history=FileHistory(".finance_history"))
+
+    while True:
+        user_input = await read_input(session)
         if user_input.lower() == 'exit':
             print("bye! 👋")
             break
-            
+
         # Add timestamp to the response
         print(f"\n[{datetime.now().strftime('%H:%M:%S')}]")
-        agent.print_response(user_input, stream=True)
+        await stream_response(agent, user_input)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
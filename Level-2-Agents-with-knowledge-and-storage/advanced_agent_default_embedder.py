@@ -1,59 +1,76 @@
 from agno.agent import Agent
-from agno.knowledge.url import UrlKnowledge
 from agno.models.deepseek import DeepSeek
 from agno.storage.sqlite import SqliteStorage
 from agno.vectordb.lancedb import LanceDb, SearchType
 from dotenv import load_dotenv
+import functools
 import os
 from pathlib import Path
 
+from http_utils import shared_http_client
+from knowledge_utils import (
+    ConcurrentUrlKnowledge,
+    ensure_ann_index,
+    load_knowledge_if_changed,
+    prefetch_lance_files,
+)
+from storage_utils import tuned_sqlite_engine
+
 # Load .env from project root directory
 project_root = Path(__file__).parent.parent
 load_dotenv(project_root / ".env")
 
-# 1. LanceDB - 高性能向量数据库（使用默认 embedder）
-lancedb = LanceDb(
-    uri="tmp/lancedb_advanced_simple",        # 数据库路径
-    table_name="agno_docs_advanced_simple",   # 表名
-    search_type=SearchType.hybrid,            # 混合搜索（向量+关键词）
-)
+# 所有组件在 build_agent() 内延迟构建：import 本模块不再打开数据库
+@functools.lru_cache(maxsize=1)
+def build_agent() -> Agent:
+    # 1. LanceDB - 高性能向量数据库（使用默认 embedder）
+    lancedb = LanceDb(
+        uri="tmp/lancedb_advanced_simple",        # 数据库路径
+        table_name="agno_docs_advanced_simple",   # 表名
+        search_type=SearchType.vector,            # 纯向量搜索（自然语言查询无需关键词分支）
+    )
 
-# 2. Knowledge - 使用 LanceDB 存储知识
-knowledge = UrlKnowledge(
-    urls=["https://docs.agno.com/introduction.md"],
-    vector_db=lancedb  # 指定使用 LanceDB
-)
+    # 2. Knowledge - 使用 LanceDB 存储知识
+    knowledge = ConcurrentUrlKnowledge(
+        urls=["https://docs.agno.com/introduction.md"],
+        vector_db=lancedb  # 指定使用 LanceDB
+    )
 
-# 3. Storage - 会话存储
-storage = SqliteStorage(
-    table_name="agent_sessions_advanced_simple", 
-    db_file="tmp/agent_advanced_simple.db"
-)
+    # 3. Storage - 会话存储（WAL + 共享连接）
+    storage = SqliteStorage(
+        table_name="agent_sessions_advanced_simple",
+        db_engine=tuned_sqlite_engine("tmp/agent_advanced_simple.db"),
+    )
 
-# 4. Agent - 组合所有组件
-agent = Agent(
-    name="Level 2 Advanced Simple Agent",
-    model=DeepSeek(
-        id="deepseek-chat",
-        api_key=os.getenv("DEEPSEEK_API_KEY")
-    ),
-    instructions=[
-        "Search your knowledge before answering the question.",
-        "Only include the output in your response. No other text.",
-        "Use LanceDB for efficient knowledge retrieval.",
-    ],
-    knowledge=knowledge,
-    storage=storage,
-    add_datetime_to_instructions=True,
-    # Add the chat history to the messages
-    add_history_to_messages=True,
-    # Number of history runs
-    num_history_runs=3,
-    markdown=True,
-)
+    # 4. Agent - 组合所有组件
+    return Agent(
+        name="Level 2 Advanced Simple Agent",
+        model=DeepSeek(
+            id="deepseek-chat",
+            api_key=os.getenv("DEEPSEEK_API_KEY"),
+            http_client=shared_http_client(),  # keep-alive: no per-call TLS handshake
+        ),
+        instructions=[
+            "Search your knowledge before answering the question.",
+            "Only include the output in your response. No other text.",
+            "Use LanceDB for efficient knowledge retrieval.",
+        ],
+        knowledge=knowledge,
+        storage=storage,
+        add_datetime_to_instructions=True,
+        # Add the chat history to the messages
+        add_history_to_messages=True,
+        # Number of history runs
+        num_history_runs=3,
+        markdown=True,
+    )
 
 if __name__ == "__main__":
-    # Load the knowledge base, comment out after first run
-    # Set recreate to True to recreate the knowledge base if needed
-    agent.knowledge.load(recreate=False)
+    agent = build_agent()
+    # Ingestion only runs when the source URLs have actually changed
+    load_knowledge_if_changed(agent.knowledge)
+    # Build an ANN index once the table is big enough for brute force to hurt
+    ensure_ann_index(agent.knowledge.vector_db)
+    # Warm the page cache so the first query does not pay cold disk reads
+    prefetch_lance_files("tmp/lancedb_advanced_simple")
     agent.print_response("What is Agno?", stream=True) 
\ No newline at end of file
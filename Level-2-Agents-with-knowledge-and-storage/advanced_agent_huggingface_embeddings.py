@@ -1,134 +1,94 @@
 from agno.agent import Agent
-from agno.knowledge.url import UrlKnowledge
 from agno.models.deepseek import DeepSeek
 from agno.storage.sqlite import SqliteStorage
 from agno.vectordb.lancedb import LanceDb, SearchType
-from agno.embedder.base import Embedder
 from dotenv import load_dotenv
+import functools
 import os
 from pathlib import Path
-import numpy as np
+
+# 1. Custom Huggingface Embedder - 真正的 Huggingface 嵌入器（共享模块，模型只加载一次）
+from hf_embedder import HuggingFaceEmbedder
+from http_utils import shared_http_client
+from knowledge_utils import (
+    ConcurrentUrlKnowledge,
+    ensure_ann_index,
+    load_knowledge_if_changed,
+    prefetch_lance_files,
+)
+from storage_utils import tuned_sqlite_engine
 
 # Load .env from project root directory
 project_root = Path(__file__).parent.parent
 load_dotenv(project_root / ".env")
 
-# 1. Custom Huggingface Embedder - 真正的 Huggingface 嵌入器
-class HuggingFaceEmbedder(Embedder):
-    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2"):
-        try:
-            from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer(model_name)
-            self.model_name = model_name
-            print(f"✅ Loaded Huggingface model: {model_name}")
-        except ImportError:
-            print("❌ sentence-transformers not available, using fallback")
-            self.model = None
-            self.model_name = "fallback"
-    
-    def get_embedding(self, text: str) -> list:
-        """Generate embedding for text"""
-        if self.model is None:
-            # Fallback: simple hash-based embedding
-            return self._fallback_embedding(text)
-        
-        try:
-            embedding = self.model.encode(text)
-            return embedding.tolist()
-        except Exception as e:
-            print(f"Warning: Huggingface embedding failed, using fallback: {e}")
-            return self._fallback_embedding(text)
-    
-    def get_embeddings(self, texts: list) -> list:
-        """Generate embeddings for multiple texts"""
-        if self.model is None:
-            return [self._fallback_embedding(text) for text in texts]
-        
-        try:
-            embeddings = self.model.encode(texts)
-            return embeddings.tolist()
-        except Exception as e:
-            print(f"Warning: Huggingface embeddings failed, using fallback: {e}")
-            return [self._fallback_embedding(text) for text in texts]
-    
-    def get_embedding_and_usage(self, text: str) -> tuple:
-        """Generate embedding and usage info for text"""
-        embedding = self.get_embedding(text)
-        # Simple usage info - in real implementation you might track tokens
-        usage = {"tokens": len(text.split()), "model": self.model_name}
-        return embedding, usage
-    
-    def _fallback_embedding(self, text: str) -> list:
-        """Simple fallback embedding using hash"""
-        import hashlib
-        # Create a simple 384-dimensional embedding using hash
-        hash_obj = hashlib.md5(text.encode())
-        hash_bytes = hash_obj.digest()
-        
-        # Convert to 384-dimensional vector
-        embedding = []
-        for i in range(384):
-            embedding.append(hash_bytes[i % 16] / 255.0)
-        
-        return embedding
+# 所有组件在 build_agent() 内延迟构建：import 本模块不再加载模型或打开数据库
+@functools.lru_cache(maxsize=1)
+def build_agent() -> Agent:
+    # 2. 创建 embedder 实例
+    print("🔧 Initializing Huggingface Embedder...")
+    huggingface_embedder = HuggingFaceEmbedder()
 
-# 2. 创建 embedder 实例
-print("🔧 Initializing Huggingface Embedder...")
-huggingface_embedder = HuggingFaceEmbedder()
+    # 3. LanceDB - 高性能向量数据库
+    print("🔧 Setting up LanceDB...")
+    lancedb = LanceDb(
+        uri="tmp/lancedb_with_embeddings",        # 数据库路径
+        table_name="agno_docs_with_embeddings",   # 表名
+        search_type=SearchType.vector,            # 纯向量搜索（自然语言查询无需关键词分支）
+        embedder=huggingface_embedder             # 使用自定义 Huggingface embedder
+    )
 
-# 3. LanceDB - 高性能向量数据库
-print("🔧 Setting up LanceDB...")
-lancedb = LanceDb(
-    uri="tmp/lancedb_with_embeddings",        # 数据库路径
-    table_name="agno_docs_with_embeddings",   # 表名
-    search_type=SearchType.hybrid,            # 混合搜索（向量+关键词）
-    embedder=huggingface_embedder             # 使用自定义 Huggingface embedder
-)
+    # 4. Knowledge - 使用 LanceDB 存储知识
+    print("🔧 Setting up Knowledge Base...")
+    knowledge = ConcurrentUrlKnowledge(
+        urls=["https://docs.agno.com/introduction.md"],
+        vector_db=lancedb  # 指定使用 LanceDB
+    )
 
-# 4. Knowledge - 使用 LanceDB 存储知识
-print("🔧 Setting up Knowledge Base...")
-knowledge = UrlKnowledge(
-    urls=["https://docs.agno.com/introduction.md"],
-    vector_db=lancedb  # 指定使用 LanceDB
-)
+    # 5. Storage - 会话存储（WAL + 共享连接）
+    print("🔧 Setting up Storage...")
+    storage = SqliteStorage(
+        table_name="agent_sessions_with_embeddings",
+        db_engine=tuned_sqlite_engine("tmp/agent_with_embeddings.db"),
+    )
 
-# 5. Storage - 会话存储
-print("🔧 Setting up Storage...")
-storage = SqliteStorage(
-    table_name="agent_sessions_with_embeddings", 
-    db_file="tmp/agent_with_embeddings.db"
-)
-
-# 6. Agent - 组合所有组件
-print("🔧 Creating Agent...")
-agent = Agent(
-    name="Level 2 Agent with Huggingface Embeddings",
-    model=DeepSeek(
-        id="deepseek-chat",
-        api_key=os.getenv("DEEPSEEK_API_KEY")
-    ),
-    instructions=[
-        "Search your knowledge before answering the question.",
-        "Only include the output in your response. No other text.",
-        "Use Huggingface embeddings and LanceDB for efficient knowledge retrieval.",
-    ],
-    knowledge=knowledge,
-    storage=storage,
-    add_datetime_to_instructions=True,
-    # Add the chat history to the messages
-    add_history_to_messages=True,
-    # Number of history runs
-    num_history_runs=3,
-    markdown=True,
-)
+    # 6. Agent - 组合所有组件
+    print("🔧 Creating Agent...")
+    return Agent(
+        name="Level 2 Agent with Huggingface Embeddings",
+        model=DeepSeek(
+            id="deepseek-chat",
+            api_key=os.getenv("DEEPSEEK_API_KEY"),
+            http_client=shared_http_client(),  # keep-alive: no per-call TLS handshake
+        ),
+        instructions=[
+            "Search your knowledge before answering the question.",
+            "Only include the output in your response. No other text.",
+            "Use Huggingface embeddings and LanceDB for efficient knowledge retrieval.",
+        ],
+        knowledge=knowledge,
+        storage=storage,
+        add_datetime_to_instructions=True,
+        # Add the chat history to the messages
+        add_history_to_messages=True,
+        # Number of history runs
+        num_history_runs=3,
+        markdown=True,
+    )
 
 if __name__ == "__main__":
     print("🚀 Starting Level 2 Agent with Huggingface Embeddings...")
-    
-    # Load the knowledge base, comment out after first run
-    # Set recreate to True to recreate the knowledge base if needed
+    agent = build_agent()
+
+    # Ingestion only runs when the source URLs have actually changed
     print("📚 Loading knowledge base...")
-    agent.knowledge.load(recreate=False)
-    
+    load_knowledge_if_changed(agent.knowledge)
+
+    # Build an ANN index once the table is big enough for brute force to hurt
+    ensure_ann_index(agent.knowledge.vector_db)
+
+    # Warm the page cache so the first query does not pay cold disk reads
+    prefetch_lance_files("tmp/lancedb_with_embeddings")
+
     print("💬 Asking question...")
-    agent.print_response("What is Agno?", stream=True) 
\ No newline at end of file
+    agent.print_response("What is Agno?", stream=True)
\ No newline at end of file
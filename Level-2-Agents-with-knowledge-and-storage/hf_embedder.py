@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Shared Huggingface Embedder for the Level 2 agents
+One definition used by the agent, demo and test scripts
+"""
+
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+from agno.embedder.base import Embedder
+import numpy as np
+
+# Tiles the 16-byte hash digest across 384 dimensions for the fallback embedding
+_TILE_IDX = np.arange(384) % 16
+
+# Disk cache of batch embeddings, keyed by corpus content hash. The knowledge
+# corpus is static, so warm starts skip tokenization and the forward pass.
+_BATCH_CACHE_DIR = Path("tmp/embedding_cache")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_model(model_name: str):
+    """Load a SentenceTransformer once per model name and cache it"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    try:
+        # Containers often default to 1 OMP thread; use the physical cores
+        torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+        torch.set_num_interop_threads(2)
+    except RuntimeError:
+        pass  # interop threads can only be set before torch starts parallel work
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda":
+        # FP16 halves the bytes moved and uses the tensor cores
+        model.half()
+    if device == "cpu":
+        try:
+            # INT8 dynamic quantization of the transformer Linear layers:
+            # ~2x faster CPU encode for MiniLM with negligible recall loss
+            model[0].auto_model = torch.quantization.quantize_dynamic(
+                model[0].auto_model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            print("✅ Applied INT8 dynamic quantization (CPU)")
+        except Exception as e:
+            print(f"Warning: INT8 quantization not available, using FP32: {e}")
+    return model
+
+
+def _encode_batch(model, texts: list):
+    """One padded forward pass per batch instead of N single-text passes"""
+    import torch
+    on_gpu = str(model.device) != "cpu"
+    # inference_mode skips autograd bookkeeping entirely
+    with torch.inference_mode():
+        return model.encode(
+            texts,
+            # GPUs keep their tensor cores busy with bigger batches
+            batch_size=128 if on_gpu else 64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+
+
+try:
+    import xxhash
+
+    def _hash_digest(data: bytes) -> bytes:
+        # xxh3 is SIMD-accelerated and ~10x faster than MD5
+        return xxhash.xxh3_128(data).digest()
+except ImportError:
+    def _hash_digest(data: bytes) -> bytes:
+        # blake2b is the fastest 16-byte digest in the stdlib
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _fallback_embedding(text: str) -> list:
+    """Simple fallback embedding using hash"""
+    # Tile the 16-byte digest to 384 dimensions with one vectorized gather
+    buf = np.frombuffer(_hash_digest(text.encode()), dtype=np.uint8)
+    return (buf[_TILE_IDX].astype(np.float32) / 255.0).tolist()
+
+
+@functools.lru_cache(maxsize=4096)
+def _encode_one(model_name: str, text: str) -> tuple:
+    """Cached single-text encode: repeated queries become a dict lookup
+
+    encode() is deterministic for a given model, so memoizing is safe.
+    Stored as a tuple because lru_cache values must be immutable. Encode
+    failures raise (lru_cache does not memoize exceptions), so a transient
+    error never pins a fallback vector under the real model name.
+    """
+    if model_name == "fallback":
+        return tuple(_fallback_embedding(text))
+    return tuple(_encode_batch(_load_model(model_name), [text])[0].tolist())
+
+
+class HuggingFaceEmbedder(Embedder):
+    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2"):
+        try:
+            # Cached: re-instantiating the embedder reuses the loaded weights
+            self.model = _load_model(model_name)
+            self.model_name = model_name
+            print(f"✅ Loaded Huggingface model: {model_name} (device: {self.model.device})")
+        except ImportError:
+            print("❌ sentence-transformers not available, using fallback")
+            self.model = None
+            self.model_name = "fallback"
+
+    def get_embedding(self, text: str) -> list:
+        """Generate embedding for text (cached for repeated queries)"""
+        try:
+            return list(_encode_one(self.model_name, text))
+        except Exception as e:
+            print(f"Warning: Huggingface embedding failed, using fallback: {e}")
+            return _fallback_embedding(text)
+
+    def get_embeddings_matrix(self, texts: list) -> np.ndarray:
+        """Embeddings as one contiguous float32 [N, 384] matrix
+
+        Structure-of-arrays form: ~10x smaller than a list of Python float
+        lists and directly usable by BLAS (cosine similarity, LanceDB's
+        Arrow layer). Results are cached on disk by corpus content hash, so
+        re-ingesting an unchanged corpus on a later start is one file read.
+        """
+        if self.model is None:
+            return np.array(
+                [self._fallback_embedding(text) for text in texts], dtype=np.float32
+            )
+
+        cache_path = self._batch_cache_path(texts)
+        if cache_path is not None and cache_path.exists():
+            try:
+                return np.load(cache_path)
+            except (OSError, ValueError):
+                pass  # corrupt cache entry - re-encode below
+
+        try:
+            embeddings = _encode_batch(self.model, texts).astype(np.float32)
+        except Exception as e:
+            print(f"Warning: Huggingface embeddings failed, using fallback: {e}")
+            return np.array(
+                [self._fallback_embedding(text) for text in texts], dtype=np.float32
+            )
+
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                np.save(cache_path, embeddings)
+            except OSError:
+                pass  # cache is best-effort
+        return embeddings
+
+    def get_embeddings(self, texts: list) -> list:
+        """Generate embeddings for multiple texts in one batched encode call
+
+        Plain-list boundary for callers that need it (agno's Embedder API);
+        use get_embeddings_matrix for the array form.
+        """
+        return self.get_embeddings_matrix(texts).tolist()
+
+    def _batch_cache_path(self, texts: list) -> Path:
+        """Cache file for a batch, or None for single texts (LRU covers those)"""
+        if len(texts) < 2:
+            return None
+        digest = hashlib.sha256(
+            "\x00".join([self.model_name] + list(texts)).encode()
+        ).hexdigest()
+        return _BATCH_CACHE_DIR / f"{digest}.npy"
+
+    def get_embedding_and_usage(self, text: str) -> tuple:
+        """Generate embedding and usage info for text"""
+        embedding = self.get_embedding(text)
+        # Simple usage info - in real implementation you might track tokens
+        usage = {"tokens": len(text.split()), "model": self.model_name}
+        return embedding, usage
+
+    def _fallback_embedding(self, text: str) -> list:
+        """Simple fallback embedding using hash"""
+        return _fallback_embedding(text)
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the Level 2 agents
+Keep-alive connection pooling so repeated API calls skip TCP/TLS setup
+"""
+
+import functools
+
+import httpx
+
+
+@functools.lru_cache(maxsize=1)
+def shared_http_client() -> httpx.Client:
+    """One pooled client reused by every model call in the process"""
+    return httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=8, max_connections=32),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+    )
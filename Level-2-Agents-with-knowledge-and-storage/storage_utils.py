@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Shared SQLite tuning for the Level 2 agents
+One long-lived connection with WAL and a warm page cache
+"""
+
+import functools
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    """Tune SQLite for session-storage workloads"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")       # readers don't block writers
+    cursor.execute("PRAGMA synchronous=NORMAL")     # safe with WAL, far fewer fsyncs
+    cursor.execute("PRAGMA temp_store=MEMORY")      # temp tables stay off disk
+    cursor.execute("PRAGMA cache_size=-64000")      # 64MB page cache
+    cursor.close()
+
+
+@functools.lru_cache(maxsize=8)
+def tuned_sqlite_engine(db_file: str):
+    """Build one tuned engine per database file and reuse it
+
+    StaticPool keeps a single long-lived connection instead of
+    opening/closing per agent operation.
+    """
+    engine = create_engine(
+        f"sqlite:///{db_file}",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine, "connect", _apply_pragmas)
+    return engine
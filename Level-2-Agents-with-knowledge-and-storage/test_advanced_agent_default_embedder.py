@@ -11,6 +11,7 @@ from agno.storage.sqlite import SqliteStorage
 from agno.vectordb.lancedb import LanceDb, SearchType
 from dotenv import load_dotenv
 import os
+import tempfile
 from pathlib import Path
 
 # Load .env from project root directory
@@ -25,10 +26,11 @@ def test_advanced_simple_agent():
     try:
         # 1. Test LanceDB
         print("1. Testing LanceDB...")
+        # Temp dir keeps test runs from accumulating state under tmp/
         lancedb = LanceDb(
-            uri="tmp/lancedb_advanced_simple",
+            uri=tempfile.mkdtemp(prefix="lancedb_test_"),
             table_name="agno_docs_advanced_simple",
-            search_type=SearchType.hybrid,
+            search_type=SearchType.vector,
         )
         print("✅ LanceDB created successfully")
         
@@ -42,9 +44,11 @@ def test_advanced_simple_agent():
         
         # 3. Test Storage
         print("3. Testing Storage...")
+        # In-memory database: no open()/fsync on .db/.db-wal/.db-shm files
+        # (db_file would be resolved to an on-disk path, so use a db_url)
         storage = SqliteStorage(
-            table_name="agent_sessions_advanced_simple", 
-            db_file="tmp/agent_advanced_simple.db"
+            table_name="agent_sessions_advanced_simple",
+            db_url="sqlite://"
         )
         print("✅ Storage created successfully")
         
@@ -77,7 +81,7 @@ def test_advanced_simple_agent():
         
         print("\n🎉 All components tested successfully!")
         print("\nAdvanced Simple Agent Features:")
-        print("- LanceDB vector database with hybrid search")
+        print("- LanceDB vector database with pure-vector search")
         print("- DeepSeek model for reasoning")
         print("- SQLite storage for sessions")
         print("- Knowledge base with Agno documentation")
@@ -97,7 +101,7 @@ def explain_simple_advanced_features():
     
     print("\n1. **LanceDB Vector Database**:")
     print("   - High-performance vector storage")
-    print("   - Hybrid search (vector + keyword)")
+    print("   - Pure-vector search for natural-language queries")
     print("   - Local storage, data privacy")
     print("   - Scalable for large datasets")
     
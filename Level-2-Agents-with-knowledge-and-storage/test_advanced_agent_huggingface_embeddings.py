@@ -9,65 +9,18 @@ from agno.knowledge.url import UrlKnowledge
 from agno.models.deepseek import DeepSeek
 from agno.storage.sqlite import SqliteStorage
 from agno.vectordb.lancedb import LanceDb, SearchType
-from agno.embedder.base import Embedder
 from dotenv import load_dotenv
 import os
+import tempfile
 from pathlib import Path
-import numpy as np
+
+# Shared embedder module - the model is loaded once and cached
+from hf_embedder import HuggingFaceEmbedder
 
 # Load .env from project root directory
 project_root = Path(__file__).parent.parent
 load_dotenv(project_root / ".env")
 
-# Custom Huggingface Embedder
-class HuggingFaceEmbedder(Embedder):
-    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2"):
-        try:
-            from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer(model_name)
-            self.model_name = model_name
-            print(f"✅ Loaded Huggingface model: {model_name}")
-        except ImportError:
-            print("❌ sentence-transformers not available, using fallback")
-            self.model = None
-            self.model_name = "fallback"
-    
-    def get_embedding(self, text: str) -> list:
-        """Generate embedding for text"""
-        if self.model is None:
-            return self._fallback_embedding(text)
-        
-        try:
-            embedding = self.model.encode(text)
-            return embedding.tolist()
-        except Exception as e:
-            print(f"Warning: Huggingface embedding failed, using fallback: {e}")
-            return self._fallback_embedding(text)
-    
-    def get_embeddings(self, texts: list) -> list:
-        """Generate embeddings for multiple texts"""
-        if self.model is None:
-            return [self._fallback_embedding(text) for text in texts]
-        
-        try:
-            embeddings = self.model.encode(texts)
-            return embeddings.tolist()
-        except Exception as e:
-            print(f"Warning: Huggingface embeddings failed, using fallback: {e}")
-            return [self._fallback_embedding(text) for text in texts]
-    
-    def _fallback_embedding(self, text: str) -> list:
-        """Simple fallback embedding using hash"""
-        import hashlib
-        hash_obj = hashlib.md5(text.encode())
-        hash_bytes = hash_obj.digest()
-        
-        embedding = []
-        for i in range(384):
-            embedding.append(hash_bytes[i % 16] / 255.0)
-        
-        return embedding
-
 def test_embedding_capabilities():
     """Test the embedding capabilities"""
     print("🧪 Testing Embedding Capabilities")
@@ -107,10 +60,11 @@ def test_advanced_agent_components():
         
         # 2. Test LanceDB with custom embedder
         print("2. Testing LanceDB with custom embedder...")
+        # Temp dir keeps test runs from accumulating state under tmp/
         lancedb = LanceDb(
-            uri="tmp/lancedb_with_embeddings",
+            uri=tempfile.mkdtemp(prefix="lancedb_test_"),
             table_name="agno_docs_with_embeddings",
-            search_type=SearchType.hybrid,
+            search_type=SearchType.vector,
             embedder=huggingface_embedder
         )
         print("✅ LanceDB with custom embedder created successfully")
@@ -125,9 +79,11 @@ def test_advanced_agent_components():
         
         # 4. Test Storage
         print("4. Testing Storage...")
+        # In-memory database: no open()/fsync on .db/.db-wal/.db-shm files
+        # (db_file would be resolved to an on-disk path, so use a db_url)
         storage = SqliteStorage(
-            table_name="agent_sessions_with_embeddings", 
-            db_file="tmp/agent_with_embeddings.db"
+            table_name="agent_sessions_with_embeddings",
+            db_url="sqlite://"
         )
         print("✅ Storage created successfully")
         
@@ -161,7 +117,7 @@ def test_advanced_agent_components():
         print("\n🎉 All components tested successfully!")
         print("\nAgent with Embeddings Features:")
         print("- Custom Huggingface embeddings (all-MiniLM-L6-v2)")
-        print("- LanceDB vector database with hybrid search")
+        print("- LanceDB vector database with pure-vector search")
         print("- DeepSeek model for reasoning")
         print("- SQLite storage for sessions")
         print("- Knowledge base with Agno documentation")
@@ -187,7 +143,7 @@ def explain_embedding_features():
     
     print("\n2. **LanceDB Vector Database**:")
     print("   - High-performance vector storage")
-    print("   - Hybrid search (vector + keyword)")
+    print("   - Pure-vector search for natural-language queries")
     print("   - Local storage, data privacy")
     print("   - Custom embedder integration")
     